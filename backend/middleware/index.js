@@ -1,6 +1,15 @@
 // middleware/index.js - Custom middleware
+const mongoose = require('mongoose');
 const { v4: uuidv4 } = require('uuid');
 
+const shouldLogRequestBody = () => {
+  const flag = process.env.LOG_REQUEST_BODY;
+  if (flag !== undefined) {
+    return flag === 'true';
+  }
+  return process.env.NODE_ENV !== 'production';
+};
+
 const requestLogger = (req, res, next) => {
   const requestId = uuidv4();
   req.requestId = requestId;
@@ -11,8 +20,10 @@ const requestLogger = (req, res, next) => {
   // Log request
   console.log(`📝 [${timestamp}] ${req.method} ${req.path} - ${requestId} - IP: ${req.ip}`);
   
-  // Log request body for POST/PUT (excluding sensitive data)
-  if ((req.method === 'POST' || req.method === 'PUT') && req.body) {
+  // Log request body for POST/PUT (excluding sensitive data).
+  // Skipped in production unless LOG_REQUEST_BODY=true, since copying and
+  // stringifying every webhook payload is the costliest part of this logger.
+  if ((req.method === 'POST' || req.method === 'PUT') && req.body && shouldLogRequestBody()) {
     const sanitizedBody = { ...req.body };
     // Remove sensitive fields from logs
     delete sanitizedBody.mobileNumber;
@@ -275,9 +286,7 @@ const validateApiKey = (req, res, next) => {
  * Health check middleware
  * Provides basic health information
  */
-const healthCheck = async (req, res) => {
-  const mongoose = require('mongoose');
-  
+const healthCheck = (req, res) => {
   const health = {
     status: 'healthy',
     timestamp: new Date().toISOString(),
@@ -5,6 +5,13 @@ const { asyncHandler, validateApiKey } = require('../middleware');
 
 const router = express.Router();
 
+const VALID_STATUSES = [
+  'APPROVED', 'QUEUED_FOR_EMBOSSING', 'IN_EMBOSSING', 'EMBOSSING_COMPLETE',
+  'EMBOSSING_FAILED', 'DISPATCHED', 'IN_TRANSIT', 'OUT_FOR_DELIVERY',
+  'DELIVERED', 'DELIVERY_FAILED', 'RETURNED', 'DESTROYED'
+];
+const VALID_STATUS_SET = new Set(VALID_STATUSES);
+
 /**
  * POST /api/v1/cards
  * Create new card journey
@@ -122,31 +129,25 @@ router.get('/:cardId', asyncHandler(async (req, res) => {
  * Get cards by specific status
  */
 router.get('/status/:status', asyncHandler(async (req, res) => {
-  const { status } = req.params;
+  const status = req.params.status.toUpperCase();
   const { limit = 50, page = 1 } = req.query;
   
-  const validStatuses = [
-    'APPROVED', 'QUEUED_FOR_EMBOSSING', 'IN_EMBOSSING', 'EMBOSSING_COMPLETE',
-    'EMBOSSING_FAILED', 'DISPATCHED', 'IN_TRANSIT', 'OUT_FOR_DELIVERY',
-    'DELIVERED', 'DELIVERY_FAILED', 'RETURNED', 'DESTROYED'
-  ];
-  
-  if (!validStatuses.includes(status.toUpperCase())) {
+  if (!VALID_STATUS_SET.has(status)) {
     return res.status(400).json({
       success: false,
       error: 'Invalid status',
-      validStatuses,
+      validStatuses: VALID_STATUSES,
       requestId: req.requestId
     });
   }
   
-  const cards = await cardService.getCardsByStatus(status.toUpperCase(), parseInt(limit));
+  const cards = await cardService.getCardsByStatus(status, parseInt(limit));
   
   res.json({
     success: true,
     data: cards,
     count: cards.length,
-    status: status.toUpperCase(),
+    status,
     page: parseInt(page),
     limit: parseInt(limit)
   });
@@ -36,7 +36,7 @@ app.use(middleware.requestLogger);
 app.use('/api', routes);
 
 // Health check
-app.get('/health', async (req, res) => {
+app.get('/health', (req, res) => {
   res.json({
     status: 'healthy',
     timestamp: new Date().toISOString(),
@@ -63,6 +63,11 @@ const startServer = async () => {
       console.log(`🌍 Environment: ${process.env.NODE_ENV || 'development'}`);
     });
 
+    // Keep idle connections open longer than upstream load balancers (60s by
+    // default) so webhook senders reuse sockets instead of reconnecting.
+    server.keepAliveTimeout = parseInt(process.env.KEEP_ALIVE_TIMEOUT_MS) || 65000;
+    server.headersTimeout = server.keepAliveTimeout + 1000;
+
     // Graceful shutdown
     process.on('SIGTERM', () => {
       console.log('SIGTERM received, shutting down gracefully');
@@ -4,6 +4,18 @@ const { encrypt, decrypt } = require('../utils/encryption');
 const { broadcast } = require('../config/websocket');
 const { sendSMSToUser } = require('../services/smsService'); // Add this import
 
+const REQUIRED_CREATE_FIELDS = ['cardId', 'customerId', 'mobileNumber', 'panMasked'];
+const REQUIRED_STATUS_FIELDS = ['status', 'source'];
+
+const findMissingFields = (data, fields) => fields.filter(field => !data[field]);
+
+// Fire-and-forget: SMS delivery must not hold up the API/webhook response
+const notifyCustomer = (customerId, type, data) => {
+  sendSMSToUser(customerId, type, data).catch(smsError => {
+    console.error('SMS sending failed:', smsError);
+  });
+};
+
 class CardService {
   
   async createCard(cardData) {
@@ -14,8 +26,9 @@ class CardService {
       } = cardData;
 
       // Validation
-      if (!cardId || !customerId || !mobileNumber || !panMasked) {
-        throw new Error('Missing required fields: cardId, customerId, mobileNumber, panMasked');
+      const missingFields = findMissingFields(cardData, REQUIRED_CREATE_FIELDS);
+      if (missingFields.length > 0) {
+        throw new Error(`Missing required fields: ${missingFields.join(', ')}`);
       }
 
       // Calculate estimated delivery
@@ -57,16 +70,11 @@ class CardService {
       });
 
       // Send SMS to customer about card approval
-      try {
-        await sendSMSToUser(customerId, 'CARD_APPROVED', {
-          cardId: cardId,
-          customerName: customerName,
-          estimatedDelivery: estimatedDelivery.toDateString()
-        });
-      } catch (smsError) {
-        console.error('SMS sending failed:', smsError);
-        // Don't throw error for SMS failure, just log it
-      }
+      notifyCustomer(customerId, 'CARD_APPROVED', {
+        cardId: cardId,
+        customerName: customerName,
+        estimatedDelivery: estimatedDelivery.toDateString()
+      });
 
       return this.sanitizeCardData(cardJourney);
 
@@ -79,295 +87,272 @@ class CardService {
   }
 
   async updateCardStatus(cardId, statusData) {
-    try {
-      const {
-        status, source, location, operatorId, batchId,
-        trackingId, failureReason, eventData
-      } = statusData;
-
-      // Validation
-      if (!status || !source) {
-        throw new Error('Missing required fields: status, source');
-      }
-
-      const cardJourney = await CardJourney.findOne({ cardId });
-      if (!cardJourney) {
-        throw new Error('Card not found');
-      }
-
-      const previousStatus = cardJourney.currentStatus;
-
-      // Calculate duration from last event
-      const lastEvent = cardJourney.journey[cardJourney.journey.length - 1];
-      let durationMinutes = null;
-      if (lastEvent) {
-        const duration = Date.now() - lastEvent.timestamp.getTime();
-        durationMinutes = Math.round(duration / (1000 * 60));
-      }
+    const {
+      status, source, location, operatorId, batchId,
+      trackingId, failureReason, eventData
+    } = statusData;
+
+    // Validation
+    const missingFields = findMissingFields(statusData, REQUIRED_STATUS_FIELDS);
+    if (missingFields.length > 0) {
+      throw new Error(`Missing required fields: ${missingFields.join(', ')}`);
+    }
 
-      // Create new journey event
-      const newEvent = {
-        stage: status,
-        source,
-        location,
-        operatorId,
-        batchId,
-        trackingId,
-        previousStage: previousStatus,
-        failureReason,
-        durationMinutes,
-        eventData: eventData || {}
-      };
-
-      // Update card journey
-      const updateData = {
-        currentStatus: status,
-        $push: { journey: newEvent }
-      };
-
-      if (failureReason) {
-        updateData.failureReason = failureReason;
-        updateData.$inc = { retryCount: 1 };
-      }
+    const cardJourney = await CardJourney.findOne({ cardId });
+    if (!cardJourney) {
+      throw new Error('Card not found');
+    }
 
-      if (status === 'DELIVERED') {
-        updateData.actualDelivery = new Date();
-      }
+    const previousStatus = cardJourney.currentStatus;
 
-      const updatedCard = await CardJourney.findOneAndUpdate(
-        { cardId },
-        updateData,
-        { new: true }
-      );
+    // Calculate duration from last event
+    const lastEvent = cardJourney.journey[cardJourney.journey.length - 1];
+    let durationMinutes = null;
+    if (lastEvent) {
+      const duration = Date.now() - lastEvent.timestamp.getTime();
+      durationMinutes = Math.round(duration / (1000 * 60));
+    }
 
-      // Broadcast real-time update
-      broadcast('status_updated', {
-        cardId,
-        previousStatus,
-        newStatus: status,
-        timestamp: new Date().toISOString(),
-        location,
-        failureReason
-      });
+    // Create new journey event
+    const newEvent = {
+      stage: status,
+      source,
+      location,
+      operatorId,
+      batchId,
+      trackingId,
+      previousStage: previousStatus,
+      failureReason,
+      durationMinutes,
+      eventData: eventData || {}
+    };
 
-      // Send SMS to customer about status update
-      try {
-        await sendSMSToUser(cardJourney.customerId, 'CARD_STATUS_UPDATE', {
-          cardId: cardId,
-          newStatus: status,
-          location: location || 'Processing Center'
-        });
-      } catch (smsError) {
-        console.error('SMS sending failed:', smsError);
-        // Don't throw error for SMS failure, just log it
-      }
+    // Update card journey
+    const updateData = {
+      currentStatus: status,
+      $push: { journey: newEvent }
+    };
 
-      // Trigger AI analysis for failures or delays
-      if (status.includes('FAILED') || durationMinutes > 480) { // 8 hours
-        setImmediate(() => this.triggerBottleneckAnalysis());
-      }
+    if (failureReason) {
+      updateData.failureReason = failureReason;
+      updateData.$inc = { retryCount: 1 };
+    }
 
-      return this.sanitizeCardData(updatedCard);
+    if (status === 'DELIVERED') {
+      updateData.actualDelivery = new Date();
+    }
 
-    } catch (error) {
-      throw error;
+    const updatedCard = await CardJourney.findOneAndUpdate(
+      { cardId },
+      updateData,
+      { new: true }
+    );
+
+    // Broadcast real-time update
+    broadcast('status_updated', {
+      cardId,
+      previousStatus,
+      newStatus: status,
+      timestamp: new Date().toISOString(),
+      location,
+      failureReason
+    });
+
+    // Send SMS to customer about status update
+    notifyCustomer(cardJourney.customerId, 'CARD_STATUS_UPDATE', {
+      cardId: cardId,
+      newStatus: status,
+      location: location || 'Processing Center'
+    });
+
+    // Trigger AI analysis for failures or delays
+    if (status.includes('FAILED') || durationMinutes > 480) { // 8 hours
+      setImmediate(() => this.triggerBottleneckAnalysis());
     }
+
+    return this.sanitizeCardData(updatedCard);
   }
 
   async searchCards(query) {
-    try {
-      if (!query || query.length < 3) {
-        throw new Error('Search query must be at least 3 characters');
-      }
-
-      let searchCriteria = {};
-
-      // Determine search type
-      if (query.toUpperCase().startsWith('CRD')) {
-        // Card ID search
-        searchCriteria.cardId = new RegExp(query, 'i');
-      } else if (query.includes('*') && query.length >= 8) {
-        // PAN search (masked)
-        searchCriteria.panMasked = query;
-      } else if (/^\d+$/.test(query) && query.length >= 4) {
-        // Might be mobile number (last 4 digits or more)
-        // Search in customer name or ID as we can't search encrypted mobile directly
-        searchCriteria.$or = [
-          { customerName: new RegExp(query, 'i') },
-          { customerId: new RegExp(query, 'i') }
-        ];
-      } else {
-        // General text search
-        searchCriteria.$or = [
-          { customerName: new RegExp(query, 'i') },
-          { customerId: new RegExp(query, 'i') },
-          { applicationId: new RegExp(query, 'i') }
-        ];
-      }
+    if (!query || query.length < 3) {
+      throw new Error('Search query must be at least 3 characters');
+    }
 
-      const cards = await CardJourney.find(searchCriteria)
-        .sort({ createdAt: -1 })
-        .limit(10);
+    let searchCriteria = {};
+
+    // Determine search type
+    if (query.toUpperCase().startsWith('CRD')) {
+      // Card ID search
+      searchCriteria.cardId = new RegExp(query, 'i');
+    } else if (query.includes('*') && query.length >= 8) {
+      // PAN search (masked)
+      searchCriteria.panMasked = query;
+    } else if (/^\d+$/.test(query) && query.length >= 4) {
+      // Might be mobile number (last 4 digits or more)
+      // Search in customer name or ID as we can't search encrypted mobile directly
+      searchCriteria.$or = [
+        { customerName: new RegExp(query, 'i') },
+        { customerId: new RegExp(query, 'i') }
+      ];
+    } else {
+      // General text search
+      searchCriteria.$or = [
+        { customerName: new RegExp(query, 'i') },
+        { customerId: new RegExp(query, 'i') },
+        { applicationId: new RegExp(query, 'i') }
+      ];
+    }
 
-      return cards.map(card => this.sanitizeCardData(card));
+    const cards = await CardJourney.find(searchCriteria)
+      .sort({ createdAt: -1 })
+      .limit(10);
 
-    } catch (error) {
-      throw error;
-    }
+    return cards.map(card => this.sanitizeCardData(card));
   }
 
   async getCardById(cardId) {
-    try {
-      const card = await CardJourney.findOne({ cardId });
-      if (!card) {
-        throw new Error('Card not found');
-      }
-      return this.sanitizeCardData(card);
-    } catch (error) {
-      throw error;
+    const card = await CardJourney.findOne({ cardId });
+    if (!card) {
+      throw new Error('Card not found');
     }
+    return this.sanitizeCardData(card);
   }
 
   async getDashboardAnalytics(timeRange = '24h') {
-    try {
-      const timeCondition = this.getTimeRangeCondition(timeRange);
-
-      // Aggregation pipeline for comprehensive analytics
-      const pipeline = [
-        { $match: { createdAt: { $gte: timeCondition } } },
-        {
-          $facet: {
-            // Total count
-            totalCards: [{ $count: "count" }],
-            
-            // Status breakdown
-            statusBreakdown: [
-              { $group: { _id: "$currentStatus", count: { $sum: 1 } } }
-            ],
-            
-            // Average delivery time for delivered cards
-            avgDeliveryTime: [
-              { $match: { actualDelivery: { $exists: true } } },
-              {
-                $project: {
-                  deliveryDays: {
-                    $divide: [
-                      { $subtract: ["$actualDelivery", "$createdAt"] },
-                      1000 * 60 * 60 * 24
-                    ]
-                  }
-                }
-              },
-              { $group: { _id: null, avgDays: { $avg: "$deliveryDays" } } }
-            ],
-            
-            // Hourly processing data
-            hourlyProcessing: [
-              {
-                $project: {
-                  hour: { $hour: "$createdAt" },
-                  date: { $dateToString: { format: "%Y-%m-%d", date: "$createdAt" } }
-                }
-              },
-              { $group: { _id: { hour: "$hour", date: "$date" }, processed: { $sum: 1 } } },
-              { $group: { _id: "$_id.hour", avgProcessed: { $avg: "$processed" } } },
-              { $sort: { _id: 1 } }
-            ],
-            
-            // Geographic data from metadata
-            geographicData: [
-              {
-                $group: {
-                  _id: { $ifNull: ["$metadata.region", "Unknown"] },
-                  total: { $sum: 1 },
-                  delivered: {
-                    $sum: { $cond: [{ $eq: ["$currentStatus", "DELIVERED"] }, 1, 0] }
-                  },
-                  failed: {
-                    $sum: { $cond: [{ $in: ["$currentStatus", ["DELIVERY_FAILED", "EMBOSSING_FAILED"]] }, 1, 0] }
-                  }
+    const timeCondition = this.getTimeRangeCondition(timeRange);
+
+    // Aggregation pipeline for comprehensive analytics
+    const pipeline = [
+      { $match: { createdAt: { $gte: timeCondition } } },
+      {
+        $facet: {
+          // Total count
+          totalCards: [{ $count: "count" }],
+          
+          // Status breakdown
+          statusBreakdown: [
+            { $group: { _id: "$currentStatus", count: { $sum: 1 } } }
+          ],
+          
+          // Average delivery time for delivered cards
+          avgDeliveryTime: [
+            { $match: { actualDelivery: { $exists: true } } },
+            {
+              $project: {
+                deliveryDays: {
+                  $divide: [
+                    { $subtract: ["$actualDelivery", "$createdAt"] },
+                    1000 * 60 * 60 * 24
+                  ]
                 }
-              },
-              {
-                $project: {
-                  region: "$_id",
-                  total: 1,
-                  delivered: 1,
-                  failed: 1,
-                  successRate: {
-                    $round: [{ $multiply: [{ $divide: ["$delivered", "$total"] }, 100] }, 1]
-                  },
-                  processing: { $subtract: ["$total", { $add: ["$delivered", "$failed"] }] }
+              }
+            },
+            { $group: { _id: null, avgDays: { $avg: "$deliveryDays" } } }
+          ],
+          
+          // Hourly processing data
+          hourlyProcessing: [
+            {
+              $project: {
+                hour: { $hour: "$createdAt" },
+                date: { $dateToString: { format: "%Y-%m-%d", date: "$createdAt" } }
+              }
+            },
+            { $group: { _id: { hour: "$hour", date: "$date" }, processed: { $sum: 1 } } },
+            { $group: { _id: "$_id.hour", avgProcessed: { $avg: "$processed" } } },
+            { $sort: { _id: 1 } }
+          ],
+          
+          // Geographic data from metadata
+          geographicData: [
+            {
+              $group: {
+                _id: { $ifNull: ["$metadata.region", "Unknown"] },
+                total: { $sum: 1 },
+                delivered: {
+                  $sum: { $cond: [{ $eq: ["$currentStatus", "DELIVERED"] }, 1, 0] }
+                },
+                failed: {
+                  $sum: { $cond: [{ $in: ["$currentStatus", ["DELIVERY_FAILED", "EMBOSSING_FAILED"]] }, 1, 0] }
                 }
-              },
-              { $sort: { total: -1 } }
-            ],
-
-            // Priority breakdown
-            priorityBreakdown: [
-              { $group: { _id: "$priority", count: { $sum: 1 } } }
-            ],
-
-            // Today's stats
-            todayStats: [
-              {
-                $match: {
-                  createdAt: {
-                    $gte: new Date(new Date().setHours(0, 0, 0, 0))
-                  }
+              }
+            },
+            {
+              $project: {
+                region: "$_id",
+                total: 1,
+                delivered: 1,
+                failed: 1,
+                successRate: {
+                  $round: [{ $multiply: [{ $divide: ["$delivered", "$total"] }, 100] }, 1]
+                },
+                processing: { $subtract: ["$total", { $add: ["$delivered", "$failed"] }] }
+              }
+            },
+            { $sort: { total: -1 } }
+          ],
+
+          // Priority breakdown
+          priorityBreakdown: [
+            { $group: { _id: "$priority", count: { $sum: 1 } } }
+          ],
+
+          // Today's stats
+          todayStats: [
+            {
+              $match: {
+                createdAt: {
+                  $gte: new Date(new Date().setHours(0, 0, 0, 0))
                 }
-              },
-              {
-                $group: {
-                  _id: null,
-                  processed: { $sum: 1 },
-                  delivered: {
-                    $sum: { $cond: [{ $eq: ["$currentStatus", "DELIVERED"] }, 1, 0] }
-                  },
-                  dispatched: {
-                    $sum: { $cond: [{ $eq: ["$currentStatus", "DISPATCHED"] }, 1, 0] }
-                  },
-                  failed: {
-                    $sum: { $cond: [{ $in: ["$currentStatus", ["DELIVERY_FAILED", "EMBOSSING_FAILED"]] }, 1, 0] }
-                  }
+              }
+            },
+            {
+              $group: {
+                _id: null,
+                processed: { $sum: 1 },
+                delivered: {
+                  $sum: { $cond: [{ $eq: ["$currentStatus", "DELIVERED"] }, 1, 0] }
+                },
+                dispatched: {
+                  $sum: { $cond: [{ $eq: ["$currentStatus", "DISPATCHED"] }, 1, 0] }
+                },
+                failed: {
+                  $sum: { $cond: [{ $in: ["$currentStatus", ["DELIVERY_FAILED", "EMBOSSING_FAILED"]] }, 1, 0] }
                 }
               }
-            ]
-          }
+            }
+          ]
         }
-      ];
-
-      const [result] = await CardJourney.aggregate(pipeline);
-
-      // Get current bottlenecks
-      const bottlenecks = await this.getCurrentBottlenecks();
-
-      return {
-        totalCards: result.totalCards[0]?.count || 0,
-        statusBreakdown: result.statusBreakdown.reduce((acc, item) => {
-          acc[item._id] = item.count;
-          return acc;
-        }, {}),
-        avgDeliveryTime: parseFloat((result.avgDeliveryTime[0]?.avgDays || 0).toFixed(1)),
-        hourlyProcessing: result.hourlyProcessing.map(item => ({
-          hour: String(item._id).padStart(2, '0') + ':00',
-          processed: Math.round(item.avgProcessed)
-        })),
-        geographicData: result.geographicData,
-        priorityBreakdown: result.priorityBreakdown.reduce((acc, item) => {
-          acc[item._id] = item.count;
-          return acc;
-        }, {}),
-        todayStats: result.todayStats[0] || {
-          processed: 0, delivered: 0, dispatched: 0, failed: 0
-        },
-        bottlenecks,
-        lastUpdated: new Date().toISOString()
-      };
+      }
+    ];
 
-    } catch (error) {
-      throw error;
-    }
+    const [result] = await CardJourney.aggregate(pipeline);
+
+    // Get current bottlenecks
+    const bottlenecks = await this.getCurrentBottlenecks();
+
+    return {
+      totalCards: result.totalCards[0]?.count || 0,
+      statusBreakdown: result.statusBreakdown.reduce((acc, item) => {
+        acc[item._id] = item.count;
+        return acc;
+      }, {}),
+      avgDeliveryTime: parseFloat((result.avgDeliveryTime[0]?.avgDays || 0).toFixed(1)),
+      hourlyProcessing: result.hourlyProcessing.map(item => ({
+        hour: String(item._id).padStart(2, '0') + ':00',
+        processed: Math.round(item.avgProcessed)
+      })),
+      geographicData: result.geographicData,
+      priorityBreakdown: result.priorityBreakdown.reduce((acc, item) => {
+        acc[item._id] = item.count;
+        return acc;
+      }, {}),
+      todayStats: result.todayStats[0] || {
+        processed: 0, delivered: 0, dispatched: 0, failed: 0
+      },
+      bottlenecks,
+      lastUpdated: new Date().toISOString()
+    };
   }
 
   async getCurrentBottlenecks() {